@@ -0,0 +1,109 @@
+"""Append-only checkpoint journal for resumable batch runs."""
+
+import json
+import os
+from typing import Any, Dict, Tuple, Union
+
+# Number of records written between fsync calls
+DEFAULT_FSYNC_EVERY = 50
+
+Outcome = Tuple[Union[Dict[str, Any], None], Union[str, None]]
+
+
+class CheckpointJournal:
+    """A JSON Lines journal of completed repositories.
+
+    Each line records one repository together with either its statistics or
+    the error message of a permanent failure. Lines are flushed as they are
+    written and fsynced in batches, so an interrupted run loses at most the
+    last unsynced batch. Reopening the same file resumes from what was recorded.
+    """
+
+    def __init__(self, path: str, fsync_every: int = DEFAULT_FSYNC_EVERY):
+        """Load any existing entries and open the journal for appending.
+
+        Args:
+            path: Journal file path, created if it does not exist
+            fsync_every: Number of records written between fsync calls
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.completed: Dict[str, Outcome] = {}
+        needs_newline = self._load()
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            # Terminate a line torn by an interrupted run
+            self._file.write("\n")
+        self._unsynced = 0
+
+    def _load(self) -> bool:
+        """Read existing entries; return True if the file ends mid-line."""
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return False
+
+        line = ""
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    repo = entry["repo"]
+                except (ValueError, KeyError, TypeError):
+                    # Skip torn or foreign lines rather than aborting the resume
+                    continue
+                self.completed[repo] = (entry.get("stats"), entry.get("error"))
+        return bool(line) and not line.endswith("\n")
+
+    def __contains__(self, repo: str) -> bool:
+        return repo in self.completed
+
+    def get(self, repo: str) -> Union[Outcome, None]:
+        """Return the recorded (stats, error) pair for a repository, if any."""
+        return self.completed.get(repo)
+
+    def record(
+        self,
+        repo: str,
+        stats: Union[Dict[str, Any], None] = None,
+        error: Union[str, None] = None,
+    ) -> None:
+        """Append a completed repository to the journal.
+
+        Args:
+            repo: Repository as given on the command line ('owner/repo')
+            stats: Statistics returned by GitHubClient.get_repo_stats
+            error: Error message if the fetch failed
+        """
+        entry: Dict[str, Any] = {"repo": repo}
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["stats"] = stats
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.completed[repo] = (stats, error)
+
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Force written records to stable storage."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Sync outstanding records and close the journal."""
+        if self._file.closed:
+            return
+        if self._unsynced:
+            self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -1,10 +1,13 @@
 import json
 import sys
-from typing import Dict, List, Tuple, Union
+from typing import Any, Dict, List, Tuple, Union
 
 import click
 
-from github import GitHubClient
+from checkpoint import CheckpointJournal
+from export import STREAMING_FORMATS, StatsWriter, open_stats_writer
+from github import GitHubClient, TransientGitHubError, fetch_many
+from summary import DEFAULT_TOP_N, StatsSummary
 
 
 def format_text_rows(stats: Dict[str, Union[str, int]]) -> Tuple[Tuple[str, str], ...]:
@@ -79,13 +82,47 @@ def format_output(stats: Dict[str, Union[str, int]], output_format: str) -> str:
         return "\n".join(lines)
 
 
+def format_summary(summary: Dict[str, Any], output_format: str) -> str:
+    """Format aggregate statistics; columnar formats fall back to text."""
+    normalized_format = output_format.lower()
+
+    if normalized_format == "json":
+        return json.dumps(summary, indent=2, sort_keys=False)
+    elif normalized_format == "yaml":
+        return format_output(summary, output_format)
+
+    count = summary["repositories"]
+    header = f"Summary of {count:,} repositories"
+    lines = [header, "-" * len(header)]
+    lines.append(f"{'Total stars':<12}: {summary['total_stars']:,}")
+    lines.append(f"{'Total forks':<12}: {summary['total_forks']:,}")
+
+    for key, metric in (("top_by_stars", "stars"), ("top_by_forks", "forks")):
+        lines.append("")
+        lines.append(f"Top {len(summary[key])} by {metric}")
+        for rank, entry in enumerate(summary[key], 1):
+            lines.append(f"  {rank:>2}. {entry['name']}: {entry[metric]:,}")
+
+    lines.append("")
+    lines.append("Languages")
+    for language, repo_count in summary["languages"].items():
+        share = repo_count / count if count else 0
+        lines.append(f"  {language:<12}: {repo_count:,} ({share:.1%})")
+
+    lines.append("")
+    lines.append("Open issues percentiles")
+    for label, value in summary["open_issues_percentiles"].items():
+        lines.append(f"  {label:<12}: {'n/a' if value is None else f'{value:,g}'}")
+    return "\n".join(lines)
+
+
 @click.command()
 @click.argument("repos", nargs=-1, required=True)
 @click.option("--token", help="GitHub API token", envvar="GITHUB_TOKEN")
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["text", "json", "yaml"], case_sensitive=False),
+    type=click.Choice(["text", "json", "yaml", "csv", "parquet"], case_sensitive=False),
     default="text",
     show_default=True,
     help="Output format",
@@ -97,11 +134,69 @@ def format_output(stats: Dict[str, Union[str, int]], output_format: str) -> str:
     type=click.Path(),
     help="Output file (default: stdout)",
 )
+@click.option(
+    "--checkpoint",
+    "checkpoint_file",
+    type=click.Path(dir_okay=False),
+    help="Journal of completed repos; rerun with the same file to resume",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of repos fetched at once; output keeps the input order",
+)
+@click.option(
+    "--http2",
+    is_flag=True,
+    help="Send requests over HTTP/2, multiplexing concurrent requests on one "
+    "connection (requires repostats[http2])",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Overall time budget in seconds; per-request timeouts shrink to fit",
+)
+@click.option(
+    "--hedge",
+    is_flag=True,
+    help="Duplicate requests slower than the observed p95 latency",
+)
+@click.option(
+    "--allow-partial",
+    is_flag=True,
+    help="Report the latest release as Unknown instead of failing a repo "
+    "when the deadline runs out",
+)
+@click.option(
+    "--summary",
+    is_flag=True,
+    help="Print aggregate statistics instead of per-repo output on stdout; "
+    "per-repo results are still written to --output when given",
+)
+@click.option(
+    "--top",
+    "top_n",
+    type=click.IntRange(min=1),
+    default=DEFAULT_TOP_N,
+    show_default=True,
+    help="Number of repos listed in each --summary ranking",
+)
 def main(
     repos: Tuple[str, ...],
     token: Union[str, None] = None,
     output_format: str = "text",
     output_file: Union[str, None] = None,
+    checkpoint_file: Union[str, None] = None,
+    concurrency: int = 1,
+    http2: bool = False,
+    deadline: Union[float, None] = None,
+    hedge: bool = False,
+    allow_partial: bool = False,
+    summary: bool = False,
+    top_n: int = DEFAULT_TOP_N,
 ):
     """Fetch statistics for one or more GitHub repositories.
 
@@ -114,25 +209,139 @@ def main(
         repostats python/cpython golang/go rust-lang/rust
 
         repostats python/cpython --format json --output stats.json
+
+        repostats python/cpython golang/go --format parquet -o repos.parquet
+
+        repostats $(cat repos.txt) --format csv -o repos.csv --checkpoint run.jsonl
+
+        repostats $(cat repos.txt) --summary --top 10
+
+        repostats $(cat repos.txt) --concurrency 8 --http2
+
+        repostats $(cat repos.txt) --deadline 60 --hedge --allow-partial
     """
-    client = GitHubClient(token)
+    streaming = output_format.lower() in STREAMING_FORMATS
+    if output_format.lower() == "parquet" and not output_file:
+        click.echo("Error: Parquet output requires --output FILE", err=True)
+        raise SystemExit(1)
+
+    try:
+        client = GitHubClient(
+            token,
+            http2=http2,
+            deadline=deadline,
+            hedge=hedge,
+            allow_partial=allow_partial,
+            pool_size=concurrency,
+        )
+    except RuntimeError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
     results: List[Dict[str, Union[str, int]]] = []
     errors: List[str] = []
+    # CSV/Parquet rows are written as they arrive instead of being kept in memory
+    writer: Union[StatsWriter, None] = None
+    succeeded = 0
+    # Aggregates are folded in one pass; per-repo output is only kept when it
+    # is going somewhere
+    aggregates = StatsSummary(top_n) if summary else None
+    per_repo_output = not summary or bool(output_file)
 
-    for repo in repos:
+    journal: Union[CheckpointJournal, None] = None
+    if checkpoint_file:
         try:
-            owner, repo_name = repo.split("/", 1)
-        except ValueError:
-            errors.append(
-                f"Error: Repository '{repo}' should be in the format 'owner/repo'"
-            )
-            continue
+            journal = CheckpointJournal(checkpoint_file)
+        except IOError as e:
+            click.echo(f"Error opening checkpoint: {e}", err=True)
+            raise SystemExit(1)
 
-        try:
-            stats = client.get_repo_stats(owner, repo_name)
-            results.append(stats)
-        except Exception as e:
-            errors.append(f"Error fetching {repo}: {e}")
+    # Outcomes recorded by a previous run are replayed instead of fetched
+    replayed = set(journal.completed) if journal is not None else set()
+
+    def needs_fetch(repo: str) -> bool:
+        return "/" in repo and repo not in replayed
+
+    # Fetched lazily and in input order, so results line up with the repos
+    # left once replayed and malformed ones are skipped
+    fetched = fetch_many(
+        (repo for repo in repos if needs_fetch(repo)),
+        concurrency=concurrency,
+        client=client,
+    )
+    try:
+        for repo in repos:
+            if "/" not in repo:
+                errors.append(
+                    f"Error: Repository '{repo}' should be in the format 'owner/repo'"
+                )
+                continue
+
+            stats: Union[Dict[str, Any], None]
+            error: Union[str, None]
+            if not needs_fetch(repo):
+                assert journal is not None
+                stats, error = journal.completed[repo]
+            else:
+                _, result = next(fetched)
+                retryable = False
+                if isinstance(result, TransientGitHubError):
+                    # Network failures, rate limits and deadline overruns stay
+                    # out of the journal so a resumed run fetches these repos
+                    stats, error, retryable = None, str(result), True
+                elif isinstance(result, Exception):
+                    stats, error = None, str(result)
+                else:
+                    stats, error = result, None
+                    # Releases that could not be fetched are fetched again on resume
+                    retryable = bool(stats.get("partial"))
+                if journal is not None and not retryable:
+                    journal.record(repo, stats, error)
+
+            if error is not None or stats is None:
+                errors.append(f"Error fetching {repo}: {error}")
+                continue
+
+            succeeded += 1
+            if aggregates is not None:
+                aggregates.add(stats)
+            if not per_repo_output:
+                continue
+            if not streaming:
+                results.append(stats)
+                continue
+
+            try:
+                if writer is None:
+                    writer = open_stats_writer(output_format, output_file)
+                writer.write(stats)
+            except (RuntimeError, IOError) as e:
+                click.echo(f"Error writing output: {e}", err=True)
+                raise SystemExit(1)
+
+        if writer is not None:
+            try:
+                writer.close()
+            except (RuntimeError, IOError) as e:
+                click.echo(f"Error writing output: {e}", err=True)
+                if output_file:
+                    click.echo(f"Incomplete output left in {output_file}", err=True)
+                raise SystemExit(1)
+    finally:
+        fetched.close()
+        client.close()
+        if journal is not None:
+            journal.close()
+        if writer is not None and not writer.closed:
+            # Finalize what was written so an interrupted export stays readable
+            try:
+                writer.abort()
+            except (RuntimeError, IOError):
+                pass
+            if output_file:
+                click.echo(f"Incomplete output left in {output_file}", err=True)
+
+    if writer is not None and output_file:
+        click.echo(f"Output written to {output_file}")
 
     # Handle output
     output_lines = []
@@ -155,7 +364,7 @@ def main(
                     raise SystemExit(1)
                 formatted = yaml.safe_dump(results, sort_keys=False).rstrip()
         output_lines.append(formatted)
-    else:
+    elif not streaming:
         # For text format, separate each repo with blank lines
         for i, stats in enumerate(results):
             if i > 0:
@@ -180,6 +389,11 @@ def main(
             click.echo(output_content)
             click.echo()
 
+    if aggregates is not None and aggregates.count:
+        click.echo()
+        click.echo(format_summary(aggregates.as_dict(), output_format))
+        click.echo()
+
     # Print errors to stderr
     if errors:
         click.echo("", err=True)
@@ -188,7 +402,7 @@ def main(
         raise SystemExit(1)
 
     # Exit with error if no successful results
-    if not results:
+    if not succeeded:
         raise SystemExit(1)
 
 
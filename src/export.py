@@ -0,0 +1,170 @@
+"""Streaming writers for columnar output formats (CSV and Parquet)."""
+
+import csv
+import sys
+from typing import IO, Any, Dict, List, Tuple, Union
+
+# Column order and types of the dictionaries produced by
+# GitHubClient.get_repo_stats; "partial" is only set on partial results
+STATS_SCHEMA: Tuple[Tuple[str, type], ...] = (
+    ("name", str),
+    ("stars", int),
+    ("forks", int),
+    ("open_issues", int),
+    ("watchers", int),
+    ("created_at", str),
+    ("updated_at", str),
+    ("language", str),
+    ("license", str),
+    ("size", int),
+    ("default_branch", str),
+    ("open_pull_requests", int),
+    ("latest_release", str),
+    ("partial", bool),
+)
+STATS_FIELDS: Tuple[str, ...] = tuple(name for name, _ in STATS_SCHEMA)
+
+STREAMING_FORMATS = ("csv", "parquet")
+
+# Records buffered per Parquet row group before they are flushed to disk
+DEFAULT_ROW_GROUP_SIZE = 10_000
+
+
+class CsvStatsWriter:
+    """Write repository statistics as CSV, one row per repository."""
+
+    def __init__(self, stream: IO[str], close_stream: bool = False):
+        """Initialize the writer and emit the header row.
+
+        Args:
+            stream: Text stream to write rows to
+            close_stream: Whether close() should also close the stream
+        """
+        self._stream = stream
+        self._close_stream = close_stream
+        self.closed = False
+        self._writer = csv.DictWriter(
+            stream, fieldnames=STATS_FIELDS, extrasaction="ignore", lineterminator="\n"
+        )
+        self._writer.writeheader()
+
+    def write(self, stats: Dict[str, Any]) -> None:
+        """Write a single repository's statistics."""
+        self._writer.writerow(
+            {**stats, "partial": "true" if stats.get("partial") else ""}
+        )
+
+    def close(self) -> None:
+        """Flush pending output and release the stream if owned."""
+        if self.closed:
+            return
+        self.closed = True
+        self._stream.flush()
+        if self._close_stream:
+            self._stream.close()
+
+    def abort(self) -> None:
+        """Stop writing; rows already written are kept."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._close_stream:
+            self._stream.close()
+
+
+class ParquetStatsWriter:
+    """Write repository statistics to a Parquet file in row groups."""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """Initialize the writer.
+
+        Args:
+            path: Destination file path
+            row_group_size: Number of records buffered per row group
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "Parquet output requested but pyarrow is not installed. "
+                "Install it with: pip install 'repostats[parquet]'"
+            )
+
+        arrow_types = {str: pa.string(), int: pa.int64(), bool: pa.bool_()}
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, arrow_types[field_type]) for name, field_type in STATS_SCHEMA]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._buffer: List[Dict[str, Any]] = []
+        self.row_group_size = row_group_size
+        self.closed = False
+
+    def write(self, stats: Dict[str, Any]) -> None:
+        """Buffer a single repository's statistics, flushing full row groups."""
+        self._buffer.append(stats)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        # Drop the buffer up front so a bad row group is never retried
+        rows, self._buffer = self._buffer, []
+        try:
+            table = self._pa.Table.from_pylist(rows, schema=self._schema)
+            self._writer.write_table(table)
+        except self._pa.ArrowException as exc:
+            raise RuntimeError(f"Could not write Parquet row group: {exc}") from exc
+
+    def close(self) -> None:
+        """Flush the final row group and finalize the file footer."""
+        if self.closed:
+            return
+        try:
+            self._flush()
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        """Discard buffered rows and finalize the row groups already written."""
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer = []
+        try:
+            self._writer.close()
+        except self._pa.ArrowException as exc:
+            raise RuntimeError(f"Could not finalize Parquet file: {exc}") from exc
+
+
+StatsWriter = Union[CsvStatsWriter, ParquetStatsWriter]
+
+
+def open_stats_writer(
+    output_format: str, output_file: Union[str, None] = None
+) -> StatsWriter:
+    """Create a streaming writer for the given output format.
+
+    Args:
+        output_format: One of STREAMING_FORMATS
+        output_file: Destination path; CSV falls back to stdout when omitted
+
+    Returns:
+        A writer exposing write(stats), close() and abort()
+    """
+    normalized_format = output_format.lower()
+
+    if normalized_format == "parquet":
+        if not output_file:
+            raise RuntimeError("Parquet output requires --output FILE")
+        return ParquetStatsWriter(output_file)
+    elif normalized_format == "csv":
+        if output_file:
+            return CsvStatsWriter(
+                open(output_file, "w", newline="", encoding="utf-8"),
+                close_stream=True,
+            )
+        return CsvStatsWriter(sys.stdout)
+    raise ValueError(f"Unsupported streaming format: {output_format}")
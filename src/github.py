@@ -1,21 +1,135 @@
-from typing import Dict, Union
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    MutableMapping,
+    Set,
+    Tuple,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from __init__ import __version__
+from quantile import P2Quantile
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_POOL_SIZE = 10
+
+# Hedge delay used until enough latencies have been observed for a p95
+DEFAULT_HEDGE_DELAY = 1.0
+HEDGE_MIN_SAMPLES = 10
+# Largest share of requests that may be duplicated by hedging
+DEFAULT_HEDGE_RATIO = 0.05
+
+RepoStats = Dict[str, Union[str, int]]
+
+
+class _Http2Response:
+    """Adapt an httpx response to the parts of the requests API we use."""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self.status_code: int = response.status_code
+        self.reason: str = response.reason_phrase
+        self.headers = response.headers
+        self.text: str = response.text
+
+    def json(self) -> Any:
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} {self.reason}", response=self  # type: ignore[arg-type]
+            )
+
+
+class TransientGitHubError(RuntimeError):
+    """A failure that may succeed on retry (network, 5xx, rate limit)."""
+
+
+class DeadlineExceeded(TransientGitHubError, requests.Timeout):
+    """Raised when a client's overall deadline budget has run out."""
+
+
+def _in_background(fn: Callable[..., Any], *args: Any) -> "Future[Any]":
+    """Run fn in a daemon thread and return a future for its result.
+
+    Requests abandoned at the deadline keep their thread until the socket
+    gives up; a daemon thread keeps them from holding up interpreter exit.
+    """
+    future: "Future[Any]" = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _is_transient(exc: requests.RequestException) -> bool:
+    """Return True if a failed request may succeed when retried later."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+    status_code: int = response.status_code
+    if status_code >= 500 or status_code in (401, 429):
+        # A 401 means the token is bad or expired, which a rerun can fix
+        return True
+    if status_code == 403:
+        # Primary rate limits empty the quota; secondary ones send Retry-After
+        return (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
+    return False
 
 
 class GitHubClient:
     """A simple GitHub API client."""
 
-    def __init__(self, token: Union[str, None] = None, timeout: Union[int, float] = 10):
+    def __init__(
+        self,
+        token: Union[str, None] = None,
+        timeout: Union[int, float] = 10,
+        http2: bool = False,
+        deadline: Union[int, float, None] = None,
+        hedge: bool = False,
+        allow_partial: bool = False,
+        base_url: str = "https://api.github.com",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        hedge_ratio: float = DEFAULT_HEDGE_RATIO,
+    ):
         """Initialize the GitHub client.
 
         Args:
             token: Optional GitHub API token for authenticated requests
             timeout: Timeout (seconds) for HTTP requests
+            http2: Multiplex requests over HTTP/2 (requires the [http2] extra)
+            deadline: Overall budget (seconds from now) for every request made
+                by this client; per-request timeouts shrink to fit it
+            hedge: Send a duplicate request when a response is slower than
+                the observed p95 latency, and use whichever answers first
+            allow_partial: Mark the latest release as "Unknown" instead of
+                failing when the deadline runs out before it is fetched
+            base_url: API root, e.g. a GitHub Enterprise endpoint
+            pool_size: Number of requests expected in flight at once; sizes
+                the connection pool
+            hedge_ratio: Largest fraction of requests that may be hedged
         """
-        self.base_url: str = "https://api.github.com"
+        self.base_url: str = base_url.rstrip("/")
         self.headers: Dict[str, str] = {
             "Accept": "application/vnd.github+json",
             "User-Agent": f"repostats/{__version__}",
@@ -23,6 +137,170 @@ class GitHubClient:
         if token:
             self.headers["Authorization"] = f"token {token}"
         self.timeout = timeout
+        self.deadline_at: Union[float, None] = (
+            None if deadline is None else time.monotonic() + deadline
+        )
+        self.hedge = hedge
+        self.allow_partial = allow_partial
+        self.hedge_ratio = hedge_ratio
+        self._latency_p95 = P2Quantile(0.95)
+        self._hedge_lock = threading.Lock()
+        self._hedge_requests = 0
+        self._hedges_sent = 0
+
+        # Reuse connections across calls instead of opening one per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._http2_client: Any = None
+        if http2:
+            try:
+                import httpx
+            except ImportError:
+                raise RuntimeError(
+                    "HTTP/2 requested but httpx is not installed. "
+                    "Install it with: pip install 'repostats[http2]'"
+                )
+            try:
+                # Plain http:// endpoints are spoken to with prior knowledge
+                # (h2c), since there is no TLS handshake to negotiate HTTP/2
+                self._http2_client = httpx.Client(
+                    http1=not self.base_url.startswith("http://"),
+                    http2=True,
+                    headers=self.headers,
+                )
+            except ImportError:
+                raise RuntimeError(
+                    "HTTP/2 requested but the h2 package is not installed. "
+                    "Install it with: pip install 'repostats[http2]'"
+                )
+
+    def remaining(self) -> Union[float, None]:
+        """Return seconds left in the deadline budget, or None if unbounded."""
+        if self.deadline_at is None:
+            return None
+        return self.deadline_at - time.monotonic()
+
+    def _request_timeout(self) -> float:
+        """Return the timeout for the next request, capped by the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded")
+        return min(self.timeout, remaining)
+
+    def _first_result(self, pending: "Set[Future[Any]]") -> Any:
+        """Return the first successful response among pending requests.
+
+        Waiting is bounded by the deadline, so a response that trickles in
+        slower than the socket timeout can notice is still cut off.
+
+        Raises:
+            DeadlineExceeded: If the deadline runs out first
+        """
+        error: Union[BaseException, None] = None
+        while pending:
+            remaining = self.remaining()
+            done, pending = wait(
+                pending,
+                timeout=None if remaining is None else max(remaining, 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                raise DeadlineExceeded("Deadline exceeded")
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result()
+        assert error is not None
+        raise error
+
+    def _get(self, url: str) -> Any:
+        """Issue a GET request within the remaining deadline budget.
+
+        Args:
+            url: Absolute API URL
+
+        Returns:
+            A requests-compatible response
+        """
+        timeout = self._request_timeout()
+        try:
+            if self.hedge:
+                return self._hedged_get(url, timeout)
+            if self.deadline_at is None:
+                return self._send(url, timeout)
+            # The timeout only bounds each socket read, so wait on the
+            # request rather than trusting it to end within the budget
+            return self._first_result({_in_background(self._send, url, timeout)})
+        except DeadlineExceeded:
+            raise
+        except requests.Timeout as exc:
+            remaining = self.remaining()
+            if remaining is not None and remaining <= 0.01:
+                raise DeadlineExceeded("Deadline exceeded") from exc
+            raise
+
+    def _send(self, url: str, timeout: float) -> Any:
+        """Issue a single GET request over the configured transport."""
+        started = time.monotonic()
+        response: Any
+        if self._http2_client is None:
+            response = self.session.get(url, headers=self.headers, timeout=timeout)
+        else:
+            import httpx
+
+            try:
+                response = _Http2Response(self._http2_client.get(url, timeout=timeout))
+            except httpx.TimeoutException as exc:
+                raise requests.Timeout(str(exc)) from exc
+            except httpx.HTTPError as exc:
+                raise requests.ConnectionError(str(exc)) from exc
+
+        if self.hedge:
+            with self._hedge_lock:
+                self._latency_p95.add(time.monotonic() - started)
+        return response
+
+    def _hedge_delay(self) -> float:
+        with self._hedge_lock:
+            if self._latency_p95.count < HEDGE_MIN_SAMPLES:
+                return DEFAULT_HEDGE_DELAY
+            return self._latency_p95.value() or DEFAULT_HEDGE_DELAY
+
+    def _take_hedge_token(self) -> bool:
+        """Reserve a hedge if fewer than hedge_ratio of requests were hedged."""
+        with self._hedge_lock:
+            if self._hedges_sent + 1 > self.hedge_ratio * self._hedge_requests:
+                return False
+            self._hedges_sent += 1
+            return True
+
+    def _hedged_get(self, url: str, timeout: float) -> Any:
+        """Send a request, duplicating it if it outlives the p95 latency.
+
+        The first successful response wins; the slower request is left to
+        finish in the background and its result is discarded.
+        """
+        with self._hedge_lock:
+            self._hedge_requests += 1
+
+        pending = {_in_background(self._send, url, timeout)}
+        done, _ = wait(pending, timeout=min(self._hedge_delay(), timeout))
+        if not done and self._take_hedge_token():
+            try:
+                pending.add(_in_background(self._send, url, self._request_timeout()))
+            except DeadlineExceeded:
+                pass
+        return self._first_result(pending)
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self.session.close()
+        if self._http2_client is not None:
+            self._http2_client.close()
 
     def get_repo_stats(self, owner: str, repo: str) -> Dict[str, Union[str, int]]:
         """Get basic statistics for a repository.
@@ -32,12 +310,23 @@ class GitHubClient:
             repo: Repository name
 
         Returns:
-            Dictionary with repository statistics
+            Dictionary with repository statistics; includes "partial": True
+            when the latest release lookup failed transiently or was cut off
+            by the deadline
+
+        Raises:
+            TransientGitHubError: For failures worth retrying later, including
+                DeadlineExceeded
+            RuntimeError: For other failures
         """
         url = f"{self.base_url}/repos/{owner}/{repo}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            response = self._get(url)
             response.raise_for_status()
+        except DeadlineExceeded as exc:
+            raise DeadlineExceeded(
+                f"Deadline exceeded before '{owner}/{repo}' was fetched"
+            ) from exc
         except requests.RequestException as exc:
             error_detail = "GitHub request failed"
             exc_response = getattr(exc, "response", None)
@@ -80,6 +369,8 @@ class GitHubClient:
                         error_detail = f"{status}: {message}"
                     else:
                         error_detail = status
+            if _is_transient(exc):
+                raise TransientGitHubError(error_detail) from exc
             raise RuntimeError(error_detail) from exc
 
         try:
@@ -88,9 +379,21 @@ class GitHubClient:
             raise RuntimeError("GitHub returned invalid JSON") from exc
 
         # Get latest release info
-        latest_release = self._get_latest_release(owner, repo)
+        partial = False
+        try:
+            latest_release = self._get_latest_release(owner, repo)
+        except DeadlineExceeded as exc:
+            if not self.allow_partial:
+                raise DeadlineExceeded(
+                    f"Deadline exceeded before the latest release of "
+                    f"'{owner}/{repo}' was fetched"
+                ) from exc
+            latest_release, partial = "Unknown", True
+        except TransientGitHubError:
+            # Keep the repository but let callers fetch the release again
+            latest_release, partial = "Unknown", True
 
-        return {
+        stats: Dict[str, Any] = {
             "name": data.get("full_name", f"{owner}/{repo}"),
             "stars": data.get("stargazers_count", 0),
             "forks": data.get("forks_count", 0),
@@ -106,6 +409,10 @@ class GitHubClient:
             - data.get("open_issues", 0),  # Approximation
             "latest_release": latest_release,
         }
+        if partial:
+            # Lets callers tell a cut-off lookup from a real "Unknown"
+            stats["partial"] = True
+        return stats
 
     def _get_latest_release(self, owner: str, repo: str) -> Union[str, None]:
         """Get the latest release tag name.
@@ -116,10 +423,14 @@ class GitHubClient:
 
         Returns:
             Latest release tag name or None if no releases
+
+        Raises:
+            TransientGitHubError: If the lookup failed in a way worth retrying,
+                including DeadlineExceeded
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/releases/latest"
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            response = self._get(url)
             if response.status_code == 404:
                 # No releases found
                 return None
@@ -127,6 +438,132 @@ class GitHubClient:
             data = response.json()
             tag_name = data.get("tag_name")
             return tag_name if tag_name else None
-        except requests.RequestException:
-            # If release fetch fails, don't fail the whole request
+        except DeadlineExceeded:
+            raise
+        except requests.RequestException as exc:
+            if _is_transient(exc):
+                raise TransientGitHubError(
+                    f"Could not fetch the latest release of '{owner}/{repo}'"
+                ) from exc
+            # If release fetch fails for good, don't fail the whole request
             return None
+
+
+def _resolved(value: Any) -> "Future[Any]":
+    future: "Future[Any]" = Future()
+    future.set_result(value)
+    return future
+
+
+def fetch_many(
+    repos: Iterable[str],
+    token: Union[str, None] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: Union[int, float] = 10,
+    ordered: bool = True,
+    cache: Union[MutableMapping[str, RepoStats], None] = None,
+    http2: bool = False,
+    deadline: Union[int, float, None] = None,
+    hedge: bool = False,
+    allow_partial: bool = False,
+    client: Union[GitHubClient, None] = None,
+) -> Generator[Tuple[str, Union[RepoStats, Exception]], None, None]:
+    """Fetch statistics for many repositories concurrently.
+
+    Repositories are pulled from the iterable lazily, with at most
+    ``concurrency`` requests in flight, so arbitrarily long inputs can be
+    consumed as a pipeline.
+
+    Args:
+        repos: Repositories in the format 'owner/repo'
+        token: Optional GitHub API token for authenticated requests
+        concurrency: Maximum number of repositories fetched at once
+        timeout: Timeout (seconds) for each HTTP request
+        ordered: Yield results in input order instead of as they complete
+        cache: Optional mapping of 'owner/repo' to stats, consulted before
+            fetching and updated with complete (non-partial) results
+        http2: Multiplex requests over HTTP/2 (requires the [http2] extra)
+        deadline: Overall budget (seconds) for the whole batch
+        hedge: Duplicate requests that outlive the observed p95 latency
+        allow_partial: Mark releases "Unknown" rather than failing a repo
+            when the deadline runs out
+        client: Existing client to use instead of creating one; the
+            connection and deadline options above are ignored when given
+
+    Yields:
+        (repo, stats) on success, or (repo, exception) on failure
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    owns_client = client is None
+    if client is None:
+        client = GitHubClient(
+            token,
+            timeout=timeout,
+            http2=http2,
+            deadline=deadline,
+            hedge=hedge,
+            allow_partial=allow_partial,
+            pool_size=concurrency,
+        )
+    fetch_client = client
+
+    def fetch(repo: str) -> Union[RepoStats, Exception]:
+        try:
+            owner, repo_name = repo.split("/", 1)
+        except ValueError:
+            return ValueError(
+                f"Repository '{repo}' should be in the format 'owner/repo'"
+            )
+        try:
+            return fetch_client.get_repo_stats(owner, repo_name)
+        except Exception as exc:
+            return exc
+
+    def outcome(repo: str, future: "Future[Any]") -> Tuple[str, Any]:
+        result = future.result()
+        if (
+            cache is not None
+            and not isinstance(result, Exception)
+            and not result.get("partial")
+        ):
+            # Partial results are fetched again rather than served from cache
+            cache[repo] = result
+        return repo, result
+
+    pending_repos = iter(repos)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+            def submit(repo: str) -> "Future[Any]":
+                if cache is not None and repo in cache:
+                    return _resolved(cache[repo])
+                return executor.submit(fetch, repo)
+
+            if ordered:
+                queue: Deque[Tuple[str, "Future[Any]"]] = deque()
+                for repo in pending_repos:
+                    queue.append((repo, submit(repo)))
+                    if len(queue) >= concurrency:
+                        yield outcome(*queue.popleft())
+                while queue:
+                    yield outcome(*queue.popleft())
+            else:
+                in_flight: Dict["Future[Any]", str] = {}
+                exhausted = False
+                while True:
+                    while not exhausted and len(in_flight) < concurrency:
+                        next_repo = next(pending_repos, None)
+                        if next_repo is None:
+                            exhausted = True
+                        else:
+                            in_flight[submit(next_repo)] = next_repo
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield outcome(in_flight.pop(future), future)
+    finally:
+        if owns_client:
+            client.close()
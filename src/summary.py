@@ -0,0 +1,96 @@
+"""Single-pass, bounded-memory aggregates over repository statistics."""
+
+import heapq
+from typing import Any, Dict, List, Tuple, Union
+
+from quantile import P2Quantile
+
+DEFAULT_TOP_N = 5
+DEFAULT_QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+
+class TopN:
+    """Keep the N largest items seen so far in a min-heap."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self._heap: List[Tuple[int, int, str]] = []
+        self._seen = 0
+
+    def add(self, value: int, name: str) -> None:
+        """Offer an item; on ties the earlier item is kept."""
+        self._seen += 1
+        item = (value, -self._seen, name)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def items(self) -> List[Tuple[str, int]]:
+        """Return (name, value) pairs, largest first."""
+        return [(name, value) for value, _, name in sorted(self._heap, reverse=True)]
+
+
+class StatsSummary:
+    """Aggregate repository statistics as they arrive."""
+
+    def __init__(
+        self,
+        top_n: int = DEFAULT_TOP_N,
+        quantiles: Tuple[float, ...] = DEFAULT_QUANTILES,
+    ):
+        """Initialize empty aggregates.
+
+        Args:
+            top_n: Number of repositories kept in each top-N ranking
+            quantiles: Open issue quantiles to estimate
+        """
+        self.count = 0
+        self.total_stars = 0
+        self.total_forks = 0
+        self.top_by_stars = TopN(top_n)
+        self.top_by_forks = TopN(top_n)
+        self.languages: Dict[str, int] = {}
+        self.open_issues = [P2Quantile(p) for p in quantiles]
+
+    def add(self, stats: Dict[str, Any]) -> None:
+        """Fold a single repository's statistics into the aggregates."""
+        name = str(stats.get("name", ""))
+        stars = int(stats.get("stars") or 0)
+        forks = int(stats.get("forks") or 0)
+        language = str(stats.get("language") or "Unknown")
+
+        self.count += 1
+        self.total_stars += stars
+        self.total_forks += forks
+        self.top_by_stars.add(stars, name)
+        self.top_by_forks.add(forks, name)
+        self.languages[language] = self.languages.get(language, 0) + 1
+        for estimator in self.open_issues:
+            estimator.add(int(stats.get("open_issues") or 0))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the aggregates as a plain, serializable dictionary."""
+        percentiles: Dict[str, Union[float, None]] = {}
+        for estimator in self.open_issues:
+            estimate = estimator.value()
+            label = f"p{estimator.p * 100:g}"
+            percentiles[label] = None if estimate is None else round(estimate, 1)
+
+        return {
+            "repositories": self.count,
+            "total_stars": self.total_stars,
+            "total_forks": self.total_forks,
+            "top_by_stars": [
+                {"name": name, "stars": value}
+                for name, value in self.top_by_stars.items()
+            ],
+            "top_by_forks": [
+                {"name": name, "forks": value}
+                for name, value in self.top_by_forks.items()
+            ],
+            "languages": dict(
+                sorted(self.languages.items(), key=lambda item: (-item[1], item[0]))
+            ),
+            "open_issues_percentiles": percentiles,
+        }
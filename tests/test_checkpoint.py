@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from checkpoint import CheckpointJournal
+
+
+@pytest.fixture
+def journal_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, "run.jsonl")
+
+
+def test_journal_records_stats_and_errors(journal_path):
+    with CheckpointJournal(journal_path) as journal:
+        journal.record("test/repo1", {"name": "test/repo1", "stars": 1})
+        journal.record("test/repo2", error="boom")
+
+    with open(journal_path) as f:
+        entries = [json.loads(line) for line in f]
+    assert entries == [
+        {"repo": "test/repo1", "stats": {"name": "test/repo1", "stars": 1}},
+        {"repo": "test/repo2", "error": "boom"},
+    ]
+
+
+def test_journal_resume(journal_path):
+    with CheckpointJournal(journal_path) as journal:
+        journal.record("test/repo1", {"name": "test/repo1", "stars": 1})
+        journal.record("test/repo2", error="boom")
+
+    with CheckpointJournal(journal_path) as journal:
+        assert "test/repo1" in journal
+        assert journal.get("test/repo1") == ({"name": "test/repo1", "stars": 1}, None)
+        assert journal.get("test/repo2") == (None, "boom")
+        assert journal.get("test/repo3") is None
+
+
+def test_journal_ignores_torn_line(journal_path):
+    with open(journal_path, "w") as f:
+        f.write('{"repo": "test/repo1", "error": "boom"}\n{"repo": "test/re')
+
+    with CheckpointJournal(journal_path) as journal:
+        assert list(journal.completed) == ["test/repo1"]
+        journal.record("test/repo2", error="boom")
+
+    with CheckpointJournal(journal_path) as journal:
+        assert list(journal.completed) == ["test/repo1", "test/repo2"]
+
+
+def test_journal_fsync_batching(journal_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+
+    journal = CheckpointJournal(journal_path, fsync_every=2)
+    for i in range(5):
+        journal.record(f"test/repo{i}", error="boom")
+    assert len(synced) == 2
+
+    journal.close()
+    assert len(synced) == 3
@@ -1,11 +1,16 @@
 import os
 import tempfile
+import threading
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 
+from checkpoint import CheckpointJournal
 from cli import main
+from github import TransientGitHubError
 
 
 def get_mock_stats(name="test/repo"):
@@ -66,7 +71,14 @@ def test_cli_with_token():
         result = runner.invoke(main, ["test/repo", "--token", "test_token"])
 
         assert result.exit_code == 0
-        mock_client.assert_called_once_with("test_token")
+        mock_client.assert_called_once_with(
+            "test_token",
+            http2=False,
+            deadline=None,
+            hedge=False,
+            allow_partial=False,
+            pool_size=1,
+        )
 
 
 def test_cli_api_error():
@@ -163,3 +175,266 @@ def test_cli_output_file():
         finally:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
+
+
+def test_cli_csv_output():
+    """Test CLI CSV output streams a header and one row per repo"""
+    runner = CliRunner()
+
+    with patch("cli.GitHubClient") as mock_client:
+        mock_instance = MagicMock()
+        mock_instance.get_repo_stats.side_effect = [
+            get_mock_stats("test/repo1"),
+            get_mock_stats("test/repo2"),
+        ]
+        mock_client.return_value = mock_instance
+
+        result = runner.invoke(main, ["test/repo1", "test/repo2", "--format", "csv"])
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert lines[0].startswith("name,stars,forks,open_issues")
+        assert lines[1].startswith("test/repo1,100,50,10")
+        assert lines[2].startswith("test/repo2,100,50,10")
+
+
+def test_cli_parquet_requires_output_file():
+    """Test CLI rejects Parquet output without --output"""
+    runner = CliRunner()
+
+    with patch("cli.GitHubClient") as mock_client:
+        result = runner.invoke(main, ["test/repo", "--format", "parquet"])
+
+        assert result.exit_code == 1
+        assert "Parquet output requires --output" in result.output
+        mock_client.assert_not_called()
+
+
+def test_cli_checkpoint_resume():
+    """Test CLI skips repos recorded in the checkpoint and replays their output"""
+    runner = CliRunner()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        checkpoint = os.path.join(temp_dir, "run.jsonl")
+
+        with patch("cli.GitHubClient") as mock_client:
+            mock_instance = MagicMock()
+            mock_instance.get_repo_stats.side_effect = [
+                get_mock_stats("test/repo1"),
+                Exception("API Error"),
+            ]
+            mock_client.return_value = mock_instance
+
+            result = runner.invoke(
+                main, ["test/repo1", "test/repo2", "--checkpoint", checkpoint]
+            )
+            assert result.exit_code == 1
+
+        with patch("cli.GitHubClient") as mock_client:
+            mock_instance = MagicMock()
+            mock_instance.get_repo_stats.return_value = get_mock_stats("test/repo3")
+            mock_client.return_value = mock_instance
+
+            result = runner.invoke(
+                main,
+                ["test/repo1", "test/repo2", "test/repo3", "--checkpoint", checkpoint],
+            )
+
+            assert result.exit_code == 1
+            assert mock_instance.get_repo_stats.call_count == 1
+            assert "test/repo1 statistics" in result.output
+            assert "test/repo3 statistics" in result.output
+            assert "Error fetching test/repo2: API Error" in result.output
+
+
+def test_cli_concurrency_keeps_input_order():
+    """Test CLI --concurrency fetches repos at once and writes them in order"""
+    runner = CliRunner()
+    # Every fetched repo must be in flight together to get past the barrier
+    barrier = threading.Barrier(3)
+
+    def get_repo_stats(owner, repo):
+        barrier.wait(5)
+        if repo == "repo0":
+            # Finish last so out-of-order completion would show in the output
+            time.sleep(0.05)
+        return get_mock_stats(f"{owner}/{repo}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        checkpoint = os.path.join(temp_dir, "run.jsonl")
+        output = os.path.join(temp_dir, "repos.csv")
+        with CheckpointJournal(checkpoint) as journal:
+            journal.record("test/repo1", get_mock_stats("test/repo1"))
+
+        with patch("cli.GitHubClient") as mock_client:
+            mock_instance = MagicMock()
+            mock_instance.get_repo_stats.side_effect = get_repo_stats
+            mock_client.return_value = mock_instance
+
+            result = runner.invoke(
+                main,
+                ["test/repo0", "test/repo1", "invalid", "test/repo2", "test/repo3"]
+                + ["--concurrency", "3", "--checkpoint", checkpoint]
+                + ["--format", "csv", "-o", output],
+            )
+
+            assert result.exit_code == 1
+            assert mock_instance.get_repo_stats.call_count == 3
+            assert mock_client.call_args.kwargs["pool_size"] == 3
+            assert "Repository 'invalid' should be in the format" in result.output
+            with open(output) as f:
+                names = [line.split(",")[0] for line in f.read().splitlines()[1:]]
+            assert names == ["test/repo0", "test/repo1", "test/repo2", "test/repo3"]
+
+
+def test_cli_summary_only():
+    """Test CLI --summary prints aggregates instead of per-repo output"""
+    runner = CliRunner()
+
+    with patch("cli.GitHubClient") as mock_client:
+        mock_instance = MagicMock()
+        mock_instance.get_repo_stats.side_effect = [
+            get_mock_stats("test/repo1"),
+            get_mock_stats("test/repo2"),
+        ]
+        mock_client.return_value = mock_instance
+
+        result = runner.invoke(main, ["test/repo1", "test/repo2", "--summary"])
+
+        assert result.exit_code == 0
+        assert "Summary of 2 repositories" in result.output
+        assert "Total stars : 200" in result.output
+        assert "test/repo1 statistics" not in result.output
+
+
+def test_cli_summary_with_output_file():
+    """Test CLI --summary alongside per-repo output written to a file"""
+    runner = CliRunner()
+
+    with patch("cli.GitHubClient") as mock_client:
+        mock_instance = MagicMock()
+        mock_instance.get_repo_stats.return_value = get_mock_stats()
+        mock_client.return_value = mock_instance
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "stats.json")
+            result = runner.invoke(
+                main,
+                ["test/repo", "--summary", "--format", "json", "--output", temp_path],
+            )
+
+            assert result.exit_code == 0
+            assert '"total_stars": 100' in result.output
+            with open(temp_path) as f:
+                assert '"name": "test/repo"' in f.read()
+
+
+def test_cli_parquet_write_error():
+    """Test CLI reports Parquet write errors instead of a traceback"""
+    pytest.importorskip("pyarrow")
+    runner = CliRunner()
+    bad_stats = get_mock_stats()
+    bad_stats["default_branch"] = 123
+
+    with patch("cli.GitHubClient") as mock_client:
+        mock_instance = MagicMock()
+        mock_instance.get_repo_stats.return_value = bad_stats
+        mock_client.return_value = mock_instance
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "stats.parquet")
+            result = runner.invoke(
+                main, ["test/repo", "--format", "parquet", "--output", temp_path]
+            )
+
+            assert result.exit_code == 1
+            assert not isinstance(result.exception, TypeError)
+            assert "Error writing output" in result.output
+            assert f"Incomplete output left in {temp_path}" in result.output
+
+
+def test_cli_checkpoint_retries_transient_errors():
+    """Test CLI refetches repos that failed transiently when resuming"""
+    runner = CliRunner()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        checkpoint = os.path.join(temp_dir, "run.jsonl")
+
+        with patch("cli.GitHubClient") as mock_client:
+            mock_instance = MagicMock()
+            mock_instance.get_repo_stats.side_effect = [
+                TransientGitHubError("GitHub API rate limit exceeded."),
+                RuntimeError("Repository 'test/gone' not found."),
+            ]
+            mock_client.return_value = mock_instance
+
+            result = runner.invoke(
+                main, ["test/limited", "test/gone", "--checkpoint", checkpoint]
+            )
+            assert result.exit_code == 1
+
+        with patch("cli.GitHubClient") as mock_client:
+            mock_instance = MagicMock()
+            mock_instance.get_repo_stats.return_value = get_mock_stats("test/limited")
+            mock_client.return_value = mock_instance
+
+            result = runner.invoke(
+                main, ["test/limited", "test/gone", "--checkpoint", checkpoint]
+            )
+
+            mock_instance.get_repo_stats.assert_called_once_with("test", "limited")
+            assert "test/limited statistics" in result.output
+            assert "Error fetching test/gone: Repository 'test/gone' not found." in (
+                result.output
+            )
+
+
+@pytest.mark.parametrize("allow_partial", [False, True])
+def test_cli_deadline_with_checkpoint(allow_partial):
+    """Test CLI leaves repos cut off by --deadline out of the checkpoint"""
+    runner = CliRunner()
+    repo_response = MagicMock()
+    repo_response.raise_for_status.return_value = None
+    repo_response.json.return_value = {"full_name": "test/repo", "stargazers_count": 1}
+    release_response = MagicMock()
+    release_response.status_code = 404
+
+    def run(args):
+        # Every request advances a fake clock by one second
+        clock = SimpleNamespace(now=0.0)
+        fake_time = SimpleNamespace(monotonic=lambda: clock.now)
+
+        def get(url, **kwargs):
+            clock.now += 1
+            if url.endswith("/releases/latest"):
+                return release_response
+            return repo_response
+
+        with patch("github.time", fake_time):
+            with patch("requests.Session.get", side_effect=get) as mock_get:
+                result = runner.invoke(main, args)
+        return result, [call[0][0] for call in mock_get.call_args_list]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        checkpoint = os.path.join(temp_dir, "run.jsonl")
+        repos = ["test/repo1", "test/repo2", "test/repo3"]
+        args = repos + ["--checkpoint", checkpoint]
+
+        # 2.5s covers repo1 (two requests) and repo2's repo request only
+        first_args = args + ["--deadline", "2.5"]
+        if allow_partial:
+            first_args.append("--allow-partial")
+        result, urls = run(first_args)
+        assert result.exit_code == 1
+        assert "Error fetching test/repo3: Deadline exceeded" in result.output
+        if allow_partial:
+            assert "Latest release: Unknown" in result.output
+        else:
+            assert "Error fetching test/repo2: Deadline exceeded" in result.output
+
+        result, urls = run(args)
+
+        assert result.exit_code == 0
+        assert not any("/repo1" in url for url in urls)
+        assert sum("/repos/test/repo2" in url for url in urls) == 2
+        assert sum("/repos/test/repo3" in url for url in urls) == 2
@@ -0,0 +1,149 @@
+import csv
+import io
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from export import STATS_FIELDS, CsvStatsWriter, open_stats_writer
+
+
+def get_stats(name="test/repo"):
+    return {
+        "name": name,
+        "stars": 100,
+        "forks": 50,
+        "open_issues": 10,
+        "watchers": 25,
+        "created_at": "2022-01-01T00:00:00Z",
+        "updated_at": "2022-02-01T00:00:00Z",
+        "language": "Python",
+        "license": "MIT",
+        "size": 1024,
+        "default_branch": "main",
+        "open_pull_requests": 5,
+        "latest_release": None,
+    }
+
+
+def test_csv_writer_round_trip():
+    stream = io.StringIO()
+    writer = CsvStatsWriter(stream)
+    writer.write(get_stats("test/repo1"))
+    writer.write(get_stats("test/repo2"))
+    writer.close()
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert tuple(rows[0].keys()) == STATS_FIELDS
+    assert [row["name"] for row in rows] == ["test/repo1", "test/repo2"]
+    assert rows[0]["stars"] == "100"
+    assert rows[0]["latest_release"] == ""
+
+
+def test_csv_writer_partial_column():
+    partial = get_stats("test/partial")
+    partial["partial"] = True
+    stream = io.StringIO()
+    writer = CsvStatsWriter(stream)
+    writer.write(get_stats("test/complete"))
+    writer.write(partial)
+    writer.close()
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row["partial"] for row in rows] == ["", "true"]
+
+
+def test_csv_writer_to_file():
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as f:
+        temp_path = f.name
+
+    try:
+        writer = open_stats_writer("csv", temp_path)
+        writer.write(get_stats())
+        writer.close()
+
+        with open(temp_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 1
+        assert rows[0]["name"] == "test/repo"
+    finally:
+        os.unlink(temp_path)
+
+
+def test_parquet_writer_without_pyarrow():
+    with patch.dict("sys.modules", {"pyarrow": None, "pyarrow.parquet": None}):
+        with pytest.raises(RuntimeError) as exc:
+            open_stats_writer("parquet", "stats.parquet")
+
+    assert "pyarrow is not installed" in str(exc.value)
+
+
+def test_parquet_writer_row_groups():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "stats.parquet")
+        writer = open_stats_writer("parquet", path)
+        writer.row_group_size = 2
+        for i in range(5):
+            writer.write(get_stats(f"test/repo{i}"))
+        writer.close()
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.metadata.num_rows == 5
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.schema_arrow.names == list(STATS_FIELDS)
+
+
+def test_parquet_writer_partial_column():
+    pq = pytest.importorskip("pyarrow.parquet")
+    partial = get_stats("test/partial")
+    partial["partial"] = True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "stats.parquet")
+        writer = open_stats_writer("parquet", path)
+        writer.write(get_stats("test/complete"))
+        writer.write(partial)
+        writer.close()
+
+        table = pq.read_table(path)
+        assert str(table.schema.field("partial").type) == "bool"
+        assert table.column("partial").to_pylist() == [None, True]
+
+
+def test_parquet_writer_converts_arrow_errors():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "stats.parquet")
+        writer = open_stats_writer("parquet", path)
+        writer.row_group_size = 1
+        writer.write(get_stats("test/good"))
+        bad = get_stats("test/bad")
+        bad["default_branch"] = 123
+        with pytest.raises(RuntimeError) as exc:
+            writer.write(bad)
+        writer.abort()
+
+        assert "Parquet" in str(exc.value)
+        assert writer.closed
+        # Row groups flushed before the failure remain readable
+        assert pq.ParquetFile(path).metadata.num_rows == 1
+
+
+def test_parquet_writer_close_failure_finalizes_file():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "stats.parquet")
+        writer = open_stats_writer("parquet", path)
+        bad = get_stats()
+        bad["default_branch"] = 123
+        writer.write(bad)
+        with pytest.raises(RuntimeError):
+            writer.close()
+
+        assert writer.closed
+        assert pq.ParquetFile(path).metadata.num_rows == 0
@@ -1,10 +1,23 @@
+import gzip
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
 from __init__ import __version__
-from github import GitHubClient
+from github import DeadlineExceeded, GitHubClient, TransientGitHubError, fetch_many
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:  # h2 comes with the [http2] extra; its tests are skipped
+    pass
 
 
 @pytest.fixture
@@ -29,7 +42,9 @@ def test_get_repo_stats(mock_response):
     release_mock = MagicMock()
     release_mock.status_code = 404
 
-    with patch("requests.get", side_effect=[mock_response, release_mock]) as mock_get:
+    with patch.object(
+        requests.Session, "get", side_effect=[mock_response, release_mock]
+    ) as mock_get:
         client = GitHubClient()
         stats = client.get_repo_stats("test", "repo")
 
@@ -68,7 +83,7 @@ def test_get_repo_stats_http_error(mock_response):
 
     mock_response.raise_for_status.side_effect = http_error
 
-    with patch("requests.get", return_value=mock_response):
+    with patch.object(requests.Session, "get", return_value=mock_response):
         client = GitHubClient()
         with pytest.raises(RuntimeError) as exc:
             client.get_repo_stats("test", "missing")
@@ -78,12 +93,552 @@ def test_get_repo_stats_http_error(mock_response):
     assert "test/missing" in str(exc.value)
 
 
+def make_http_error(status_code, headers=None):
+    error_response = MagicMock()
+    error_response.status_code = status_code
+    error_response.reason = "Error"
+    error_response.headers = headers or {}
+    error_response.json.return_value = {"message": "Error"}
+    return requests.HTTPError(response=error_response)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.ConnectionError("connection reset"),
+        requests.Timeout("read timed out"),
+        make_http_error(502),
+        make_http_error(403, {"X-RateLimit-Remaining": "0"}),
+        make_http_error(403, {"X-RateLimit-Remaining": "4999", "Retry-After": "60"}),
+        make_http_error(401),
+    ],
+)
+def test_get_repo_stats_transient_errors(mock_response, error):
+    with patch.object(requests.Session, "get", side_effect=error):
+        client = GitHubClient()
+        with pytest.raises(TransientGitHubError):
+            client.get_repo_stats("test", "repo")
+
+
+@pytest.mark.parametrize("status_code", [404, 403, 422])
+def test_get_repo_stats_permanent_errors(mock_response, status_code):
+    mock_response.raise_for_status.side_effect = make_http_error(status_code)
+
+    with patch.object(requests.Session, "get", return_value=mock_response):
+        client = GitHubClient()
+        with pytest.raises(RuntimeError) as exc:
+            client.get_repo_stats("test", "repo")
+
+    assert not isinstance(exc.value, TransientGitHubError)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.Timeout("read timed out"),
+        make_http_error(503),
+        make_http_error(403, {"X-RateLimit-Remaining": "0"}),
+    ],
+)
+def test_release_lookup_transient_errors(mock_response, error):
+    with patch.object(requests.Session, "get", side_effect=[mock_response, error]):
+        client = GitHubClient()
+        stats = client.get_repo_stats("test", "repo")
+
+    assert stats["latest_release"] == "Unknown"
+    assert stats["partial"] is True
+
+
+def test_release_lookup_permanent_error(mock_response):
+    with patch.object(
+        requests.Session, "get", side_effect=[mock_response, make_http_error(422)]
+    ):
+        client = GitHubClient()
+        stats = client.get_repo_stats("test", "repo")
+
+    assert stats["latest_release"] is None
+    assert "partial" not in stats
+
+
 def test_get_repo_stats_invalid_json(mock_response):
     mock_response.json.side_effect = ValueError("no json")
 
-    with patch("requests.get", return_value=mock_response):
+    with patch.object(requests.Session, "get", return_value=mock_response):
         client = GitHubClient()
         with pytest.raises(RuntimeError) as exc:
             client.get_repo_stats("test", "repo")
 
     assert "invalid JSON" in str(exc.value)
+
+
+def stand_in_payload(path):
+    """Return a canned GitHub response body for a request path."""
+    if path.endswith("/releases/latest"):
+        payload = {"tag_name": "v1.0.0", "body": "Release notes. " * 50}
+    else:
+        payload = {
+            "full_name": "test/repo",
+            "stargazers_count": 100,
+            "description": "A repository description. " * 20,
+            "topics": ["python", "cli", "github", "statistics"] * 10,
+        }
+    return json.dumps(payload).encode()
+
+
+class _CountingWriter:
+    """Count bytes a handler writes to its socket."""
+
+    def __init__(self, wfile, server):
+        self._wfile = wfile
+        self._server = server
+
+    def write(self, data):
+        self._server.bytes_sent += len(data)
+        return self._wfile.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._wfile, name)
+
+
+class StandInGitHubHandler(BaseHTTPRequestHandler):
+    """Serve canned GitHub responses, gzip-compressed when the client allows."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.wfile = _CountingWriter(self.wfile, self.server)
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.server.requests.append(self.path)
+        if len(self.server.requests) == 1 and self.server.hold_first is not None:
+            self.server.hold_first.wait(5)
+        if self.server.barrier is not None:
+            # Hold requests until the expected number are in flight at once
+            try:
+                self.server.barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+        self.server.accept_encodings.append(self.headers.get("Accept-Encoding", ""))
+        body = stand_in_payload(self.path)
+        self.server.raw_bytes += len(body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.server.byte_delay is None:
+            self.wfile.write(body)
+            return
+        # Trickle the body so no single socket read ever times out
+        for i in range(len(body)):
+            if self.server.stopped.wait(self.server.byte_delay):
+                return
+            self.wfile.write(body[i : i + 1])
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInGitHubHandler)
+    server.connections = set()
+    server.accept_encodings = []
+    server.requests = []
+    server.hold_first = None
+    server.barrier = None
+    server.byte_delay = None
+    server.stopped = threading.Event()
+    server.bytes_sent = 0
+    server.raw_bytes = 0
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.stopped.set()
+    server.shutdown()
+    server.server_close()
+
+
+class StandInH2Server:
+    """Cleartext HTTP/2 (h2c, prior knowledge) GitHub stand-in built on h2.
+
+    The first requests on a connection are answered together once
+    ``hold_until`` of them are open at the same time (or the connection goes
+    idle), which makes stream multiplexing observable without relying on
+    timing. Later requests are answered as they arrive.
+    """
+
+    def __init__(self, hold_until=1, status=200):
+        self.hold_until = hold_until
+        self.status = status
+        self.connections = 0
+        self.requests = []
+        self.accept_encodings = []
+        self.max_open_streams = 0
+        self.bytes_sent = 0
+        self.raw_bytes = 0
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        conn.initiate_connection()
+        sock.settimeout(1)
+        pending = []
+        hold_until = self.hold_until
+        with sock:
+            self._send(sock, conn)
+            while True:
+                try:
+                    data = sock.recv(65535)
+                except socket.timeout:
+                    data = None
+                except OSError:
+                    return
+                if data == b"":
+                    return
+                for event in conn.receive_data(data) if data else []:
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers = dict(event.headers)
+                        pending.append((event.stream_id, headers))
+                        self.requests.append(headers[":path"])
+                        self.accept_encodings.append(headers.get("accept-encoding", ""))
+                self.max_open_streams = max(self.max_open_streams, len(pending))
+                if pending and (len(pending) >= hold_until or data is None):
+                    for stream_id, headers in pending:
+                        self._respond(conn, stream_id, headers)
+                    pending = []
+                    hold_until = 1
+                self._send(sock, conn)
+
+    def _respond(self, conn, stream_id, headers):
+        body = stand_in_payload(headers[":path"])
+        self.raw_bytes += len(body)
+        response_headers = [(":status", str(self.status))]
+        if "gzip" in headers.get("accept-encoding", ""):
+            body = gzip.compress(body)
+            response_headers.append(("content-encoding", "gzip"))
+        response_headers.append(("content-length", str(len(body))))
+        conn.send_headers(stream_id, response_headers)
+        conn.send_data(stream_id, body, end_stream=True)
+
+    def _send(self, sock, conn):
+        data = conn.data_to_send()
+        if data:
+            self.bytes_sent += len(data)
+            sock.sendall(data)
+
+    def close(self):
+        self._sock.close()
+
+
+@pytest.fixture
+def h2_server():
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    servers = []
+
+    def start(**kwargs):
+        server = StandInH2Server(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_get_repo_stats_reuses_connection(stand_in_server):
+    client = GitHubClient(base_url=f"http://127.0.0.1:{stand_in_server.server_port}")
+    for _ in range(3):
+        stats = client.get_repo_stats("test", "repo")
+    client.close()
+
+    assert stats["stars"] == 100
+    assert stats["latest_release"] == "v1.0.0"
+    # Six requests share one pooled keep-alive connection
+    assert len(stand_in_server.connections) == 1
+    # requests negotiates compression by default; bodies arrive gzipped
+    assert all("gzip" in value for value in stand_in_server.accept_encodings)
+    assert stand_in_server.bytes_sent < stand_in_server.raw_bytes
+
+
+def test_get_repo_stats_http2_transport(h2_server):
+    server = h2_server()
+    client = GitHubClient(http2=True, base_url=f"http://127.0.0.1:{server.port}")
+    for _ in range(3):
+        stats = client.get_repo_stats("test", "repo")
+    client.close()
+
+    assert stats["stars"] == 100
+    assert stats["latest_release"] == "v1.0.0"
+    assert server.connections == 1
+    assert len(server.requests) == 6
+    assert all("gzip" in value for value in server.accept_encodings)
+
+
+def test_http2_multiplexes_concurrent_requests(stand_in_server, h2_server):
+    repos = [f"test/repo{i}" for i in range(4)]
+
+    # HTTP/1.1: four requests in flight at once need four sockets
+    stand_in_server.barrier = threading.Barrier(4, timeout=5)
+    client = GitHubClient(base_url=f"http://127.0.0.1:{stand_in_server.server_port}")
+    http1_results = list(fetch_many(repos, client=client, concurrency=4))
+    client.close()
+
+    # HTTP/2: the same four requests share one socket as concurrent streams
+    server = h2_server(hold_until=4)
+    client = GitHubClient(http2=True, base_url=f"http://127.0.0.1:{server.port}")
+    http2_results = list(fetch_many(repos, client=client, concurrency=4))
+    client.close()
+
+    assert [stats["stars"] for _, stats in http1_results] == [100] * 4
+    assert [stats["stars"] for _, stats in http2_results] == [100] * 4
+    assert len(stand_in_server.connections) == 4
+    assert server.connections == 1
+    assert server.max_open_streams == 4
+    # HPACK header compression keeps HTTP/2 below HTTP/1.1 for the same bodies
+    assert server.bytes_sent < stand_in_server.bytes_sent
+
+
+def test_http2_transport_maps_http_errors(h2_server):
+    server = h2_server(status=404)
+    client = GitHubClient(http2=True, base_url=f"http://127.0.0.1:{server.port}")
+    with pytest.raises(RuntimeError) as exc:
+        client.get_repo_stats("test", "missing")
+    client.close()
+
+    assert "test/missing" in str(exc.value)
+
+
+def test_http2_without_httpx():
+    with patch.dict("sys.modules", {"httpx": None}):
+        with pytest.raises(RuntimeError) as exc:
+            GitHubClient(http2=True)
+
+    assert "httpx is not installed" in str(exc.value)
+
+
+def make_fake_client(delays=None):
+    """Return a client whose get_repo_stats sleeps per repo, then echoes it."""
+    delays = delays or {}
+    client = MagicMock()
+
+    def get_repo_stats(owner, repo):
+        time.sleep(delays.get(repo, 0))
+        if repo == "broken":
+            raise RuntimeError("API Error")
+        if repo == "partial":
+            return {"name": f"{owner}/{repo}", "partial": True}
+        return {"name": f"{owner}/{repo}"}
+
+    client.get_repo_stats.side_effect = get_repo_stats
+    return client
+
+
+def test_fetch_many_ordered():
+    client = make_fake_client({"slow": 0.05})
+    repos = ["test/slow", "test/fast", "test/broken", "invalid"]
+
+    results = list(fetch_many(repos, client=client, concurrency=4))
+
+    assert [repo for repo, _ in results] == repos
+    assert results[0][1] == {"name": "test/slow"}
+    assert isinstance(results[2][1], RuntimeError)
+    assert isinstance(results[3][1], ValueError)
+    assert "owner/repo" in str(results[3][1])
+
+
+def test_fetch_many_as_completed():
+    client = make_fake_client({"slow": 0.05})
+
+    results = list(fetch_many(["test/slow", "test/fast"], client=client, ordered=False))
+
+    assert [repo for repo, _ in results] == ["test/fast", "test/slow"]
+
+
+def test_fetch_many_consumes_input_lazily():
+    client = make_fake_client()
+    pulled = []
+
+    def repos():
+        for i in range(100):
+            pulled.append(i)
+            yield f"test/repo{i}"
+
+    results = fetch_many(repos(), client=client, concurrency=3)
+    repo, stats = next(results)
+    results.close()
+
+    assert repo == "test/repo0"
+    assert len(pulled) <= 4
+
+
+def test_fetch_many_cache():
+    client = make_fake_client()
+    cache = {"test/cached": {"name": "test/cached", "stars": 1}}
+
+    results = dict(
+        fetch_many(
+            ["test/cached", "test/new", "test/broken", "test/partial"],
+            client=client,
+            cache=cache,
+        )
+    )
+
+    assert results["test/cached"] == {"name": "test/cached", "stars": 1}
+    assert results["test/partial"]["partial"] is True
+    assert client.get_repo_stats.call_count == 3
+    assert cache["test/new"] == {"name": "test/new"}
+    assert "test/broken" not in cache
+    assert "test/partial" not in cache
+
+
+def test_fetch_many_invalid_concurrency():
+    with pytest.raises(ValueError):
+        list(fetch_many(["test/repo"], concurrency=0))
+
+
+def test_request_timeout_derived_from_deadline(mock_response):
+    release_mock = MagicMock()
+    release_mock.status_code = 404
+
+    with patch.object(
+        requests.Session, "get", side_effect=[mock_response, release_mock]
+    ) as mock_get:
+        client = GitHubClient(deadline=2)
+        client.get_repo_stats("test", "repo")
+
+    assert 0 < mock_get.call_args_list[0][1]["timeout"] <= 2
+    assert mock_get.call_args_list[1][1]["timeout"] <= 2
+
+
+def test_deadline_exceeded_before_fetch():
+    with patch.object(requests.Session, "get") as mock_get:
+        client = GitHubClient(deadline=1)
+        client.deadline_at = time.monotonic() - 1
+        with pytest.raises(DeadlineExceeded) as exc:
+            client.get_repo_stats("test", "repo")
+
+    mock_get.assert_not_called()
+    assert "Deadline exceeded" in str(exc.value)
+
+
+@pytest.mark.parametrize("allow_partial", [True, False])
+def test_deadline_exceeded_before_release(mock_response, allow_partial):
+    client = GitHubClient(deadline=10, allow_partial=allow_partial)
+
+    def expire_after_repo(url, **kwargs):
+        client.deadline_at = time.monotonic() - 1
+        return mock_response
+
+    with patch.object(requests.Session, "get", side_effect=expire_after_repo):
+        if allow_partial:
+            stats = client.get_repo_stats("test", "repo")
+            assert stats["latest_release"] == "Unknown"
+            assert stats["partial"] is True
+            assert stats["stars"] == 100
+        else:
+            with pytest.raises(DeadlineExceeded) as exc:
+                client.get_repo_stats("test", "repo")
+            assert "latest release" in str(exc.value)
+            assert isinstance(exc.value, TransientGitHubError)
+
+
+@pytest.mark.parametrize("hedge", [False, True])
+def test_deadline_cuts_off_slow_body(stand_in_server, hedge):
+    # Each byte arrives well within the read timeout, but the whole body
+    # takes far longer than the deadline
+    stand_in_server.byte_delay = 0.1
+    client = GitHubClient(
+        deadline=0.5,
+        hedge=hedge,
+        base_url=f"http://127.0.0.1:{stand_in_server.server_port}",
+    )
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.get_repo_stats("test", "repo")
+    elapsed = time.monotonic() - started
+    client.close()
+
+    # Returns at the deadline, long before the body could have finished
+    assert len(stand_in_payload("/repos/test/repo")) * 0.1 > 10
+    assert elapsed < 5
+
+
+def test_hedged_request_beats_slow_response(stand_in_server):
+    # The first request is held until the client has returned, so the
+    # answer can only have come from its hedge
+    stand_in_server.hold_first = threading.Event()
+    client = GitHubClient(
+        hedge=True,
+        hedge_ratio=1.0,
+        base_url=f"http://127.0.0.1:{stand_in_server.server_port}",
+    )
+
+    with patch("github.DEFAULT_HEDGE_DELAY", 0.05):
+        stats = client.get_repo_stats("test", "repo")
+    held = not stand_in_server.hold_first.is_set()
+    stand_in_server.hold_first.set()
+    client.close()
+
+    assert held
+    assert stats["stars"] == 100
+    assert stand_in_server.requests.count("/repos/test/repo") == 2
+
+
+def test_hedge_budget_caps_duplicates():
+    client = GitHubClient(hedge=True, hedge_ratio=0.1)
+    gates = {}
+    grants = []
+    take_hedge_token = client._take_hedge_token
+
+    def send(url, timeout):
+        # Primaries stall until the hedge decision has been made
+        gate = gates[url]
+        if not gate.is_set():
+            gate.wait(5)
+        return MagicMock(status_code=200)
+
+    def take():
+        granted = take_hedge_token()
+        grants.append(granted)
+        for gate in gates.values():
+            gate.set()
+        return granted
+
+    with patch.object(client, "_send", side_effect=send), patch.object(
+        client, "_take_hedge_token", side_effect=take
+    ), patch("github.DEFAULT_HEDGE_DELAY", 0.001):
+        for i in range(20):
+            url = f"http://127.0.0.1/repos/test/repo{i}"
+            gates[url] = threading.Event()
+            client._get(url)
+    client.close()
+
+    # Every primary outlived the hedge delay, but only 10% were duplicated
+    assert len(grants) == 20
+    assert sum(grants) == 2
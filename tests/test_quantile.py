@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from quantile import P2Quantile
+
+
+def test_p2_quantile_exact_for_small_samples():
+    estimator = P2Quantile(0.5)
+    assert estimator.value() is None
+    for value in [5, 1, 3]:
+        estimator.add(value)
+    assert estimator.value() == 3
+
+
+def test_p2_quantile_approximates_large_streams():
+    rng = random.Random(42)
+    values = [rng.uniform(0, 1000) for _ in range(20_000)]
+    estimators = {p: P2Quantile(p) for p in (0.5, 0.9, 0.99)}
+    for value in values:
+        for estimator in estimators.values():
+            estimator.add(value)
+
+    ordered = sorted(values)
+    for p, estimator in estimators.items():
+        exact = ordered[int(p * (len(ordered) - 1))]
+        assert estimator.value() == pytest.approx(exact, abs=15)
@@ -0,0 +1,40 @@
+from summary import StatsSummary, TopN
+
+
+def test_top_n_keeps_largest_and_earliest_ties():
+    top = TopN(2)
+    top.add(10, "a")
+    top.add(30, "b")
+    top.add(20, "c")
+    top.add(30, "d")
+    assert top.items() == [("b", 30), ("d", 30)]
+
+
+def test_stats_summary():
+    summary = StatsSummary(top_n=2)
+    for name, stars, forks, language, issues in [
+        ("test/a", 10, 1, "Python", 4),
+        ("test/b", 30, 5, "Go", 8),
+        ("test/c", 20, 9, "Python", 0),
+    ]:
+        summary.add(
+            {
+                "name": name,
+                "stars": stars,
+                "forks": forks,
+                "language": language,
+                "open_issues": issues,
+            }
+        )
+
+    result = summary.as_dict()
+    assert result["repositories"] == 3
+    assert result["total_stars"] == 60
+    assert result["total_forks"] == 15
+    assert result["top_by_stars"] == [
+        {"name": "test/b", "stars": 30},
+        {"name": "test/c", "stars": 20},
+    ]
+    assert result["top_by_forks"][0] == {"name": "test/c", "forks": 9}
+    assert result["languages"] == {"Python": 2, "Go": 1}
+    assert result["open_issues_percentiles"]["p50"] == 4